@@ -1,60 +1,37 @@
-import asyncio
-import json
 import logging
+
+import orjson
 from fastapi.staticfiles import StaticFiles
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from models import TreadmillStatus, SpeedRequest
+import logging_config
+from models import SpeedRequest, TreadmillStatus
 from treadmill_controller import TreadmillController
     
 # -------- Logging setup --------
+logging_config.configure()
 logger = logging.getLogger("treadmill")
-logger.setLevel(logging.DEBUG)
-
-# Avoid duplicate handlers if app is reloaded
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
 # -------- FastAPI app setup --------
-app = FastAPI()
-
-# SSE status queue
-status_queue: asyncio.Queue[TreadmillStatus] = asyncio.Queue()
-
-controller = TreadmillController(status_queue=status_queue)
+app = FastAPI(default_response_class=ORJSONResponse)
 
-# Log each request and exceptions
-from fastapi.responses import JSONResponse, StreamingResponse
-from fastapi.exceptions import HTTPException as FastAPIHTTPException
+controller = TreadmillController()
 
-# Middleware to log requests and responses
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"--> {request.method} {request.url.path}")
-    try:
-        response = await call_next(request)
-    except FastAPIHTTPException as http_exc:
-        # Already handled in the endpoint; just log status
+# Request lines come from Uvicorn's access log and unhandled errors from its
+# error log. Endpoints log their own 500s with a traceback, so only client
+# errors on the API are logged here (not static-file 404s).
+@app.exception_handler(StarletteHTTPException)
+async def log_http_exception(request: Request, exc: StarletteHTTPException):
+    if request.url.path.startswith("/api/") and exc.status_code < 500:
         logger.warning(
-            f"HTTPException during {request.method} {request.url.path}: "
-            f"status={http_exc.status_code}, detail={http_exc.detail}"
-        )
-        return JSONResponse(
-            status_code=http_exc.status_code,
-            content={"detail": http_exc.detail},
+            "HTTPException during %s %s: status=%d, detail=%s",
+            request.method, request.url.path, exc.status_code, exc.detail,
         )
-    except Exception:
-        logger.exception(f"Unhandled error during {request.method} {request.url.path}")
-        raise
-
-    logger.info(f"<-- {request.method} {request.url.path} {response.status_code}")
-    return response
+    return await http_exception_handler(request, exc)
 
 
 # CORS: allow your Angular dev server (adjust origins as you like)
@@ -71,22 +48,49 @@ app.add_middleware(
 )
 
 # -------- API Endpoints --------
-@app.get("/api/status", response_model=TreadmillStatus)
-async def get_status() -> TreadmillStatus:
-    return controller.get_status()
+@app.get("/api/status")
+async def get_status() -> Response:
+    return Response(content=controller.get_status_json(), media_type="application/json")
 
+# Original stream with a full status per update, kept for existing consumers
 @app.get("/api/events")
 async def sse_events():
     async def event_generator():
-        while True:
-            status: TreadmillStatus = await status_queue.get()
-            # SSE format: one event = "data: ...\n\n"
-            payload = status.model_dump()  # or .dict() depending on your Pydantic version
-            yield f"data: {json.dumps(payload)}\n\n"
+        queue = controller.subscribe()
+        try:
+            while True:
+                event, _payload = await queue.get()
+                if event is None:
+                    # SSE format: one event = "data: ...\n\n"
+                    yield f"data: {controller.get_status_json().decode()}\n\n"
+        finally:
+            controller.unsubscribe(queue)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
-@app.post("/api/connect", response_model=TreadmillStatus)
+@app.get("/api/status/stream")
+async def status_stream():
+    async def event_generator():
+        # Subscribe before taking the snapshot so no update falls in between;
+        # the queue starts empty, so nothing older than the snapshot is replayed
+        queue = controller.subscribe()
+        try:
+            # Full snapshot first so the client has a base to apply deltas to
+            yield f"data: {controller.get_status_json().decode()}\n\n"
+            while True:
+                event, payload = await queue.get()
+                data = orjson.dumps(payload).decode()
+                # SSE format: one event = "data: ...\n\n", named ones get an "event:" line
+                if event is None:
+                    yield f"data: {data}\n\n"
+                else:
+                    yield f"event: {event}\ndata: {data}\n\n"
+        finally:
+            controller.unsubscribe(queue)
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+@app.post("/api/connect", response_model=None)
 async def connect() -> TreadmillStatus:
     try:
         await controller.connect()
@@ -96,7 +100,7 @@ async def connect() -> TreadmillStatus:
     return controller.get_status()
 
 
-@app.post("/api/disconnect", response_model=TreadmillStatus)
+@app.post("/api/disconnect", response_model=None)
 async def disconnect() -> TreadmillStatus:
     try:
         await controller.disconnect()
@@ -106,7 +110,7 @@ async def disconnect() -> TreadmillStatus:
     return controller.get_status()
 
 
-@app.post("/api/start", response_model=TreadmillStatus)
+@app.post("/api/start", response_model=None)
 async def start() -> TreadmillStatus:
     try:
         await controller.start()
@@ -116,7 +120,7 @@ async def start() -> TreadmillStatus:
     return controller.get_status()
 
 
-@app.post("/api/stop", response_model=TreadmillStatus)
+@app.post("/api/stop", response_model=None)
 async def stop() -> TreadmillStatus:
     try:
         await controller.stop()
@@ -126,14 +130,13 @@ async def stop() -> TreadmillStatus:
     return controller.get_status()
 
 
-@app.post("/api/speed", response_model=TreadmillStatus)
-async def set_speed(req: SpeedRequest) -> TreadmillStatus:
-    try:
-        await controller.set_speed(req.speedKmh)
-    except Exception as e:
-        logger.exception("Error in /api/speed")
-        raise HTTPException(status_code=500, detail=str(e))
-    return controller.get_status()
+# Accepted, not applied: the BLE write (connecting first if needed) happens
+# after a short debounce. The resulting speed arrives via the status stream,
+# a failure as a "commandError" event there, so there is no body.
+@app.post("/api/speed", response_model=None, status_code=202)
+async def set_speed(req: SpeedRequest) -> Response:
+    await controller.set_speed(req.speedKmh)
+    return Response(status_code=202)
 
 # --- Static frontend (Angular build) ---
 # Everything that is NOT /api/... will be served from ./static
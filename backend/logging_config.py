@@ -0,0 +1,15 @@
+import logging
+
+
+def configure() -> None:
+    logger = logging.getLogger("treadmill")
+    logger.setLevel(logging.DEBUG)
+
+    # Avoid duplicate handlers if app is reloaded
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
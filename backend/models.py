@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from typing import Annotated, TypedDict
 
-class TreadmillStatus(BaseModel):
+from pydantic import BaseModel, ConfigDict, Field
+
+class TreadmillStatus(TypedDict):
     isConnected: bool
     isRunning: bool
     currentSpeedKmh: float
@@ -11,4 +13,6 @@ class TreadmillStatus(BaseModel):
     maxSpeedKmh: float
 
 class SpeedRequest(BaseModel):
-    speedKmh: float
\ No newline at end of file
+    model_config = ConfigDict(extra="forbid")
+
+    speedKmh: Annotated[float, Field(ge=0.0, le=20.0)]
\ No newline at end of file
@@ -1,25 +1,59 @@
 import asyncio
 import logging
+import shutil
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
 
-import subprocess
-from typing import Optional
+import orjson
 from bleak import BleakClient, BleakScanner
-from fastapi import logger
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
 
 from models import TreadmillStatus
 
-# ----- Logging setup --------
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+logger = logging.getLogger("treadmill.controller")
+
+# Resolved once so adapter resets don't search PATH each time
+_BLUETOOTHCTL = shutil.which("bluetoothctl") or "bluetoothctl"
+
+# -------- Static command frames --------
+# fa ef 11 00 00 00 00 f3 04
+_START_CMD = bytes([0xFA, 0xEF, 0x11, 0x00, 0x00, 0x00, 0x00, 0xF3, 0x04])
+# fa ef 11 00 00 00 00 f4 05
+_STOP_CMD = bytes([0xFA, 0xEF, 0x11, 0x00, 0x00, 0x00, 0x00, 0xF4, 0x05])
+# fa ef 11 00 00 00 <speed> 11 <checksum>; only touched by the command worker
+_SPEED_FRAME = bytearray(b"\xFA\xEF\x11\x00\x00\x00\x00\x11\x00")
+
+
+def _encode_speed_frame(speed_code: int) -> bytes:
+    speed_code_byte = speed_code & 0xFF
+
+    buf = _SPEED_FRAME
+    buf[6] = speed_code_byte
+    buf[8] = (speed_code_byte + 0x22) & 0xFF  # checksum
+    # Copy out, the write may still reference the payload after we return
+    return bytes(buf)
+
+
+# Every 0.1 km/h step between 1.0 and 6.0 km/h, keyed by speed in deci-km/h
+_SPEED_FRAMES: Dict[int, bytes] = {
+    code: _encode_speed_frame(code) for code in range(10, 61)
+}
+
+
+# -------- Notification frame layouts --------
+_STATUS_HEAD = struct.Struct(">HH")
+_U16_LE = struct.Struct("<H")
+
+
+# -------- Command channel --------
+@dataclass
+class Command:
+    kind: str
+    payload: Any
+    fut: asyncio.Future
 
-# Avoid duplicate handlers if app is reloaded
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
 # -------- TreadmillController class --------
 class TreadmillController:
@@ -31,11 +65,41 @@ class TreadmillController:
 
     NOTIFICATION_SPEED_RANGE = 0x90
     NOTIFICATION_TYPE_SPEED_SET = 0x91
+    NOTIFICATION_TYPE_CURRENT_SPEED = 0x92
     NOTIFICATION_TYPE_STATUS_UPDATE = 0x95
 
-    def __init__(self, status_queue: Optional[asyncio.Queue] = None) -> None:        
+    # Upper bound for a scan when the treadmill is not advertising; a miss is
+    # retried by the connect loop
+    SCAN_TIMEOUT = 3.0
+
+    # Scan-and-connect attempts before giving up; each one is bounded by
+    # CONNECT_TIMEOUT (covers the scan window plus the connect itself)
+    CONNECT_ATTEMPTS = 3
+    CONNECT_TIMEOUT = 10.0
+    CONNECT_BACKOFF = 0.2
+    ADAPTER_RESET_EVERY = 2
+    # Cleanup disconnect after a failed or timed-out attempt gives up after this
+    CLEANUP_DISCONNECT_TIMEOUT = 1.0
+
+    # Direct (scan-less) connect to the last known address, and subscribing
+    # to its notifications, each give up after this
+    DIRECT_CONNECT_TIMEOUT = 3.0
+
+    # Speed requests within this window are collapsed into one BLE write
+    SPEED_DEBOUNCE_INTERVAL = 0.08
+
+    # Notifications arriving within this window are sent as one SSE update
+    STATUS_FLUSH_INTERVAL = 0.05
+    # Pending updates per stream client before it is resynced with a snapshot
+    STATUS_QUEUE_SIZE = 64
+
+    def __init__(self) -> None:        
         self._client: Optional[BleakClient] = None
-        self._lock = asyncio.Lock()
+        self._target_lc = self.TARGET_NAME_FRAGMENT.lower()
+        # Tracked from connect/disconnect transitions so status reads never query bleak
+        self._connected = False
+        # Address of the last treadmill we connected to, lets reconnects skip the scan
+        self._last_address: Optional[str] = None
         self._is_running = False
         self._current_speed_kmh = 0.0
         self._elapsed_time_seconds = 0
@@ -44,8 +108,37 @@ class TreadmillController:
         self._min_speed_kmh = 0.0
         self._max_speed_kmh = 0.0
 
-        self._status_queue = status_queue
-        self._monitor_task: Optional[asyncio.Task] = None
+        self._notification_decoders = {
+            self.NOTIFICATION_TYPE_SPEED_SET: self._decode_speed_set,
+            self.NOTIFICATION_TYPE_CURRENT_SPEED: self._decode_current_speed,
+            self.NOTIFICATION_TYPE_STATUS_UPDATE: self._decode_status_update,
+            self.NOTIFICATION_SPEED_RANGE: self._decode_speed_range,
+        }
+
+        # Pre-serialized status payload, rebuilt lazily after any state change
+        self._status_json: Optional[bytes] = None
+
+        # One bounded queue per open status stream; items are (event, payload)
+        # with event None for status deltas
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._pending_delta: Dict[str, Any] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # All BLE actions are run one at a time by a single worker task
+        self._commands: asyncio.Queue[Command] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._last_enqueued: Optional[Command] = None
+
+        self._pending_speed: Optional[float] = None
+        self._speed_timer: Optional[asyncio.TimerHandle] = None
+        self._speed_task: Optional[asyncio.Task] = None
+        self._handlers = {
+            "connect": self._do_connect,
+            "disconnect": self._do_disconnect,
+            "start": self._do_start,
+            "stop": self._do_stop,
+            "speed": self._do_set_speed,
+        }
 
     # -------- internal helpers --------
 
@@ -58,109 +151,133 @@ class TreadmillController:
             except Exception:
                 logger.warning("Error while disconnecting stale client", exc_info=True)
             self._client = None
+            self._connected = False
+            self._is_running = False
+            self._current_speed_kmh = 0.0
+            self._invalidate_status()
+            self._push_status_update({
+                "isConnected": False,
+                "isRunning": False,
+                "currentSpeedKmh": 0.0,
+            })
 
         # If still connected, we're good
         if self._client and self._client.is_connected:
             return
 
-        # We'll try up to 2 attempts:
-        #  - attempt 1: normal connect
-        #  - on failure OR device not found: reset adapter, attempt 2
-        for attempt in (1, 2):
-            logger.info(f"BLE connect attempt {attempt}/2")
-
-            logger.info("Scanning for treadmill devices...")
-            devices = await BleakScanner.discover()
-            for d in devices:
-                logger.info(f"Found device: name={d.name!r}, address={d.address!r}")
-
-            device = next(
-                (d for d in devices
-                 if d.name and self.TARGET_NAME_FRAGMENT.lower() in d.name.lower()),
-                None
-            )
+        if self._last_address and await self._connect_last_known():
+            return
 
-            if device is None:
-                msg = f"Could not find treadmill with name containing '{self.TARGET_NAME_FRAGMENT}'"
-                logger.warning(msg)
+        for attempt in range(1, self.CONNECT_ATTEMPTS + 1):
+            logger.info(f"BLE connect attempt {attempt}/{self.CONNECT_ATTEMPTS}")
 
-                if attempt == 1:
-                    logger.info("No treadmill found, resetting adapter before retrying scan")
+            try:
+                await asyncio.wait_for(self._try_connect(), timeout=self.CONNECT_TIMEOUT)
+                return  # success, we're done
+            except Exception as e:
+                logger.exception(f"Failed to connect to treadmill on attempt {attempt}: {e!r}")
+                if attempt == self.CONNECT_ATTEMPTS:
+                    raise RuntimeError(
+                        f"Failed to connect to treadmill after {attempt} attempts"
+                    ) from e
+
+                # Adapter resets take seconds themselves, so not after every attempt
+                if (attempt - 1) % self.ADAPTER_RESET_EVERY == 0:
+                    logger.info("Attempting Bluetooth adapter reset before retrying connect")
                     try:
                         await self._reset_bluetooth_adapter()
                     except Exception:
-                        logger.exception("Failed to reset Bluetooth adapter after device-not-found")
-                        raise RuntimeError("Could not find treadmill and adapter reset failed")
-                    # loop continues to attempt 2
-                    continue
-                else:
-                    # second attempt, still no device -> give up
-                    raise RuntimeError("Could not find treadmill after adapter reset")
+                        logger.exception("Failed to reset Bluetooth adapter")
+                        raise RuntimeError("Failed to connect and failed to reset adapter") from e
 
-            logger.info(f"Connecting to treadmill: name={device.name!r}, address={device.address!r}")
-            client = BleakClient(device)
+            await asyncio.sleep(self.CONNECT_BACKOFF * 2 ** (attempt - 1))
 
+    async def _try_connect(self) -> None:
+        logger.info("Scanning for treadmill devices...")
+        # Stops scanning as soon as the treadmill shows up
+        device = await BleakScanner.find_device_by_filter(
+            self._is_treadmill,
+            timeout=self.SCAN_TIMEOUT,
+        )
+        if device is None:
+            msg = f"Could not find treadmill with name containing '{self.TARGET_NAME_FRAGMENT}'"
+            logger.warning(msg)
+            raise RuntimeError(msg)
+
+        logger.info(f"Connecting to treadmill: name={device.name!r}, address={device.address!r}")
+        client = BleakClient(device, disconnected_callback=self._on_disconnect)
+
+        try:
+            await client.connect()
+            logger.info("Connected to treadmill via BLE")
+            await self._attach_client(client)
+        except BaseException:
+            # Also reached when wait_for cancels us on timeout; best-effort
+            # cleanup, bounded so a hung disconnect can't stretch the attempt
             try:
-                await client.connect()
-                logger.info("Connected to treadmill via BLE")
+                await asyncio.wait_for(client.disconnect(), timeout=self.CLEANUP_DISCONNECT_TIMEOUT)
+            except Exception:
+                pass
+            raise
 
-                try:
-                    await client.start_notify(self.NOTIFY_CHAR_UUID, self._notification_handler)
-                    logger.info("Subscribed to treadmill notifications")
-                except Exception:
-                    logger.warning("Could not enable notifications on treadmill (FFB1)", exc_info=True)
+        self._last_address = device.address
 
-                self._client = client
+    def _is_treadmill(self, device: BLEDevice, _adv: AdvertisementData) -> bool:
+        return bool(device.name) and self._target_lc in device.name.lower()
 
-                # Start background connection monitor
-                if self._monitor_task is None or self._monitor_task.done():
-                    self._monitor_task = asyncio.create_task(self._monitor_connection(client))
+    async def _connect_last_known(self) -> bool:
+        logger.info(f"Connecting to last known treadmill address {self._last_address!r}")
+        client = BleakClient(self._last_address, disconnected_callback=self._on_disconnect)
 
-                return  # success, we're done
+        try:
+            await client.connect(timeout=self.DIRECT_CONNECT_TIMEOUT)
+            logger.info("Connected to treadmill via BLE")
+            await asyncio.wait_for(self._attach_client(client), timeout=self.DIRECT_CONNECT_TIMEOUT)
+        except Exception:
+            # Best effort only: any failure here falls back to scan/reset
+            logger.info("Direct connect failed, falling back to scan", exc_info=True)
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+            return False
 
-            except Exception as e:
-                logger.exception(f"Failed to connect to treadmill on attempt {attempt}: {e}")
+        return True
 
-                # Best-effort cleanup
-                try:
-                    await client.disconnect()
-                except Exception:
-                    pass
+    async def _attach_client(self, client: BleakClient) -> None:
+        try:
+            await client.start_notify(self.NOTIFY_CHAR_UUID, self._notification_handler)
+            logger.info("Subscribed to treadmill notifications")
+        except Exception:
+            logger.warning("Could not enable notifications on treadmill (FFB1)", exc_info=True)
 
-                if attempt == 1:
-                    logger.info("Attempting Bluetooth adapter reset before retrying connect")
-                    try:
-                        await self._reset_bluetooth_adapter()
-                    except Exception:
-                        logger.exception("Failed to reset Bluetooth adapter")
-                        raise RuntimeError("Failed to connect and failed to reset adapter") from e
-                    # loop continues to attempt 2
-                else:
-                    # second attempt also failed -> give up
-                    raise RuntimeError("Failed to connect to treadmill after adapter reset") from e
+        self._client = client
+        self._connected = True
+        self._invalidate_status()
+        self._push_status_update({"isConnected": True})
 
-    async def _monitor_connection(self, client: BleakClient) -> None:
+    def _on_disconnect(self, client: BleakClient) -> None:
         """
-        Background task: watch a specific BleakClient instance and
-        update state when it disconnects.
+        Bleak disconnect callback: update state when the active client
+        drops (treadmill switched off, out of range, manual disconnect).
         """
-        try:
-            # Poll once per second; adjust if you want it faster/slower
-            while client.is_connected:
-                await asyncio.sleep(0.5)
-        except asyncio.CancelledError:
-            # Task cancelled (e.g. on manual disconnect); just exit
+        # Ignore clients we already replaced or gave up on
+        if self._client is not client:
             return
 
-        # If this is still the active client, clear state
-        if self._client is client:
-            logger.info("Treadmill BLE client disconnected (monitor)")
-            self._client = None
-            self._is_running = False
-            self._current_speed_kmh = 0.0
+        logger.info("Treadmill BLE client disconnected")
+        self._client = None
+        self._connected = False
+        self._is_running = False
+        self._current_speed_kmh = 0.0
+        self._invalidate_status()
 
-            # Push a final "disconnected" status so UI updates
-            self._push_status_update()
+        # Push a final "disconnected" delta so UI updates
+        self._push_status_update({
+            "isConnected": False,
+            "isRunning": False,
+            "currentSpeedKmh": 0.0,
+        })
 
 
     async def _reset_bluetooth_adapter(self) -> None:
@@ -172,68 +289,66 @@ class TreadmillController:
         - bluez tools installed (bluetoothctl / hciconfig)
         - /var/run/dbus mounted so bluetoothctl can talk to bluetoothd
         """
-        loop = asyncio.get_running_loop()
+        # Option A: via bluetoothctl (clean, talks to bluetoothd)
+        logger.info("Resetting Bluetooth adapter via bluetoothctl (power off/on)")
+        await self._run_bluetoothctl("power", "off")
 
-        def _do_reset():
-            # Option A: via bluetoothctl (clean, talks to bluetoothd)
-            logger.info("Resetting Bluetooth adapter via bluetoothctl (power off/on)")
-            try:
-                # Power off
-                subprocess.run(
-                    ["bluetoothctl", "power", "off"],
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-            except subprocess.CalledProcessError as e:
-                logger.warning(
-                    "Error powering off adapter via bluetoothctl: %s", e.stderr.strip()
-                )
-
-            # Small delay to make sure power-off is processed
-            subprocess.run(["sleep", "2"])
+        # Small delay to make sure power-off is processed
+        await asyncio.sleep(2)
 
-            try:
-                # Power on
-                subprocess.run(
-                    ["bluetoothctl", "power", "on"],
-                    check=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-            except subprocess.CalledProcessError as e:
-                logger.warning(
-                    "Error powering on adapter via bluetoothctl: %s", e.stderr.strip()
-                )
-
-        # Run blocking operations in a thread so we don't block the event loop
-        await loop.run_in_executor(None, _do_reset)
+        await self._run_bluetoothctl("power", "on")
         logger.info("Bluetooth adapter reset sequence finished")
 
-    def _notification_handler(self, _char_handle: int, data: bytearray) -> None:     
-        notification_type = data[2]
-
-        if notification_type == self.NOTIFICATION_TYPE_SPEED_SET:
-            self._current_speed_kmh = data[6] / 10.0
-            logger.info("Treadmill speed set notification: speed=%.1f km/h", self._current_speed_kmh)
-
-        if notification_type == self.NOTIFICATION_TYPE_STATUS_UPDATE:
-            seconds_hi = data[3] 
-            seconds_lo = data[4] 
-            self._elapsed_time_seconds = (seconds_hi << 8) | seconds_lo
+    async def _run_bluetoothctl(self, *args: str) -> None:
+        proc = await asyncio.create_subprocess_exec(
+            _BLUETOOTHCTL,
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            logger.warning(
+                "Error running 'bluetoothctl %s': %s",
+                " ".join(args),
+                stderr.decode(errors="replace").strip(),
+            )
 
-            flags = data[5]
+    def _notification_handler(self, _char_handle: int, data: bytearray) -> None:
+        decoder = self._notification_decoders.get(data[2])
+        delta = decoder(data) if decoder is not None else {}
 
-            distance_hi = data[5] & 0x0F
-            distance_lo = data[6]
-            self._total_distance_km = ((distance_hi << 8) | distance_lo) / 100.0
+        self._is_running = self._current_speed_kmh > 0.0
+        self._invalidate_status()
 
-            calories_lo = data[8]
-            calories_hi = data[9]
-            self._burned_calories = (calories_hi << 8) | calories_lo
+        # Push only the changed fields to the queue for SSE
+        if delta:
+            if "currentSpeedKmh" in delta:
+                delta["isRunning"] = self._is_running
+            self._push_status_update(delta)
+        logger.debug("Notification from treadmill: %s\n", data.hex())
 
+    def _decode_speed_set(self, data: bytearray) -> Dict[str, Any]:
+        self._current_speed_kmh = data[6] / 10.0
+        logger.info("Treadmill speed set notification: speed=%.1f km/h", self._current_speed_kmh)
+        return {"currentSpeedKmh": self._current_speed_kmh}
+
+    def _decode_current_speed(self, data: bytearray) -> Dict[str, Any]:
+        self._current_speed_kmh = data[6] / 10.0
+        logger.info("Treadmill current speed notification: speed=%.1f km/h", self._current_speed_kmh)
+        return {"currentSpeedKmh": self._current_speed_kmh}
+
+    def _decode_status_update(self, data: bytearray) -> Dict[str, Any]:
+        # Seconds (big-endian) at 3-4; distance is the low 12 bits of the
+        # big-endian word at 5-6 (high nibble of byte 5 holds flags)
+        seconds, distance_word = _STATUS_HEAD.unpack_from(data, 3)
+        flags = data[5]
+        self._elapsed_time_seconds = seconds
+        self._total_distance_km = (distance_word & 0x0FFF) / 100.0
+        # Calories are little-endian at 8-9
+        self._burned_calories = _U16_LE.unpack_from(data, 8)[0]
+
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
                 "Treadmill workout update: time=%d sec, distance=%.2f km, calories=%d kcal, flags=0x%02X",
                 self._elapsed_time_seconds,
@@ -241,33 +356,59 @@ class TreadmillController:
                 self._burned_calories,
                 flags,
             )
+        return {
+            "elapsedTimeSeconds": self._elapsed_time_seconds,
+            "totalDistanceKm": self._total_distance_km,
+            "burnedCalories": self._burned_calories,
+        }
+
+    def _decode_speed_range(self, data: bytearray) -> Dict[str, Any]:
+        self._min_speed_kmh = data[5] / 10.0
+        self._max_speed_kmh = data[6] / 10.0
+        logger.info("Treadmill speed range notification: lowest=%.1f km/h, highest=%.1f km/h",
+                    self._min_speed_kmh,
+                    self._max_speed_kmh)
+        return {
+            "minSpeedKmh": self._min_speed_kmh,
+            "maxSpeedKmh": self._max_speed_kmh,
+        }
+
+    def _invalidate_status(self) -> None:
+        self._status_json = None
+
+    def _push_status_update(self, delta: Dict[str, Any]) -> None:
+        if not self._subscribers:
+            return
 
-        if notification_type == 0x92:
-            self._current_speed_kmh = data[6] / 10.0
-            logger.info("Treadmill current speed notification: speed=%.1f km/h", self._current_speed_kmh)
+        # Merge into the pending update; a burst of notifications is flushed
+        # as a single delta once the interval has passed.
+        self._pending_delta.update(delta)
+        if self._flush_handle is None:
+            # We are already in the event loop thread when Bleak calls us
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.STATUS_FLUSH_INTERVAL, self._flush_status)
+
+    def _flush_status(self) -> None:
+        self._flush_handle = None
+        delta, self._pending_delta = self._pending_delta, {}
+        if not delta:
+            return
 
-        if notification_type == self.NOTIFICATION_SPEED_RANGE:
-            self._min_speed_kmh = data[5] / 10.0
-            self._max_speed_kmh = data[6] / 10.0
-            logger.info("Treadmill speed range notification: lowest=%.1f km/h, highest=%.1f km/h",
-                        self._min_speed_kmh,
-                        self._max_speed_kmh)
-        
-        # Push updated status to the queue for SSE
-        self._push_status_update()
+        self._broadcast((None, delta))
 
-        self._is_running = self._current_speed_kmh > 0.0
-        logger.debug("Notification from treadmill: %s\n", data.hex())
-
-    def _push_status_update(self) -> None:
-        if self._status_queue is not None:
-            status = self.get_status()
-            # We are already in the event loop thread when Bleak calls us,
-            # so putting into the queue directly is fine.
+    def _broadcast(self, item: Tuple[Optional[str], Dict[str, Any]]) -> None:
+        for queue in self._subscribers:
             try:
-                self._status_queue.put_nowait(status)
+                queue.put_nowait(item)
             except asyncio.QueueFull:
-                logger.warning("Status queue is full, dropping update")
+                # Dropping single deltas would leave fields stale on the client,
+                # so replace its backlog with one full snapshot instead
+                logger.warning("Status stream client is lagging, resyncing with full status")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((None, self.get_status()))
+                if item[0] is not None:
+                    queue.put_nowait(item)
 
     async def _send_command(self, payload: bytes) -> None:
         if not self._client or not self._client.is_connected:
@@ -279,102 +420,178 @@ class TreadmillController:
             response=False,  # write without response
         )
 
-    # -------- public API used by FastAPI --------
-
-    async def connect(self) -> None:
-        async with self._lock:
-            await self._ensure_connected()
+    # -------- command worker --------
 
-    async def disconnect(self) -> None:
-        async with self._lock:
-            if self._monitor_task is not None:
-                self._monitor_task.cancel()
-                self._monitor_task = None
+    async def _run_worker(self) -> None:
+        while True:
+            cmd = await self._commands.get()
+            if cmd is self._last_enqueued:
+                self._last_enqueued = None
 
-            if self._client:
+            try:
+                result = await self._handlers[cmd.kind](cmd.payload)
+            except Exception as e:
+                if not cmd.fut.done():
+                    cmd.fut.set_exception(e)
+            else:
+                if not cmd.fut.done():
+                    cmd.fut.set_result(result)
+
+    async def _submit(self, kind: str, payload: Any = None) -> Any:
+        # Started lazily: the controller is created before the event loop runs
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_worker())
+
+        # Coalesce with a speed command that is still waiting at the tail
+        # of the queue; both callers then share its result.
+        pending = self._last_enqueued
+        if kind == "speed" and pending is not None and pending.kind == "speed":
+            pending.payload = payload
+            return await asyncio.shield(pending.fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        cmd = Command(kind, payload, fut)
+        self._last_enqueued = cmd
+        await self._commands.put(cmd)
+        return await asyncio.shield(fut)
+
+    async def _do_connect(self, _payload: Any) -> None:
+        await self._ensure_connected()
+
+    async def _do_disconnect(self, _payload: Any) -> None:
+        if self._client:
+            try:
+                # Try to stop notifications first (best effort)
                 try:
-                    # Try to stop notifications first (best effort)
-                    try:
-                        logger.info("Stopping treadmill notifications before disconnect")
-                        await self._client.stop_notify(self.NOTIFY_CHAR_UUID)
-                    except Exception:
-                        logger.warning("Error while stopping notifications", exc_info=True)
-
-                    await self._client.disconnect()
-                    logger.info("Disconnected from treadmill")
+                    logger.info("Stopping treadmill notifications before disconnect")
+                    await self._client.stop_notify(self.NOTIFY_CHAR_UUID)
                 except Exception:
-                    logger.warning("Error while disconnecting client", exc_info=True)
+                    logger.warning("Error while stopping notifications", exc_info=True)
 
-            self._client = None
-            self._is_running = False
-            self._current_speed_kmh = 0.0
+                await self._client.disconnect()
+                logger.info("Disconnected from treadmill")
+            except Exception:
+                logger.warning("Error while disconnecting client", exc_info=True)
 
+        self._client = None
+        self._connected = False
+        self._is_running = False
+        self._current_speed_kmh = 0.0
+        self._invalidate_status()
+        self._push_status_update({
+            "isConnected": False,
+            "isRunning": False,
+            "currentSpeedKmh": 0.0,
+        })
+
+    async def _do_start(self, _payload: Any) -> None:
+        await self._ensure_connected()
+        await self._send_command(self._build_start_command())
+
+    async def _do_stop(self, _payload: Any) -> None:
+        await self._ensure_connected()
+        await self._send_command(self._build_stop_command())
+
+    async def _do_set_speed(self, speed_kmh: float) -> None:
+        await self._ensure_connected()
+
+        # Clamp for safety (adjust per your treadmill’s range)
+        if speed_kmh < self._min_speed_kmh:
+            speed_kmh = self._min_speed_kmh
+        if speed_kmh > self._max_speed_kmh:
+            speed_kmh = self._max_speed_kmh
+
+        cmd = self._build_speed_command(speed_kmh)
+        await self._send_command(cmd)
+        self._current_speed_kmh = speed_kmh
+        self._is_running = speed_kmh > 0.0
+        self._invalidate_status()
+        self._push_status_update({
+            "currentSpeedKmh": self._current_speed_kmh,
+            "isRunning": self._is_running,
+        })
+
+    def _flush_speed(self) -> None:
+        self._speed_timer = None
+        speed_kmh, self._pending_speed = self._pending_speed, None
+        if speed_kmh is None:
+            return
+
+        self._speed_task = asyncio.create_task(self._submit("speed", speed_kmh))
+        self._speed_task.add_done_callback(self._on_speed_written)
+
+    def _on_speed_written(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+
+        logger.error("Failed to set treadmill speed", exc_info=task.exception())
+        # Nobody awaits the deferred write, so tell the stream clients instead
+        self._broadcast(("commandError", {"command": "speed", "detail": str(task.exception())}))
+
+    # -------- public API used by FastAPI --------
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.STATUS_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def connect(self) -> None:
+        await self._submit("connect")
+
+    async def disconnect(self) -> None:
+        await self._submit("disconnect")
 
     async def start(self) -> None:
-        async with self._lock:
-            await self._ensure_connected()
-            await self._send_command(self._build_start_command())
+        await self._submit("start")
 
     async def stop(self) -> None:
-        async with self._lock:
-            await self._ensure_connected()
-            await self._send_command(self._build_stop_command())
+        await self._submit("stop")
 
     async def set_speed(self, speed_kmh: float) -> None:
-        async with self._lock:
-            await self._ensure_connected()
-
-            # Clamp for safety (adjust per your treadmill’s range)
-            if speed_kmh < self._min_speed_kmh:
-                speed_kmh = self._min_speed_kmh
-            if speed_kmh > self._max_speed_kmh:
-                speed_kmh = self._max_speed_kmh
-
-            cmd = self._build_speed_command(speed_kmh)
-            await self._send_command(cmd)
-            self._current_speed_kmh = speed_kmh
-            self._is_running = speed_kmh > 0.0
+        # Only schedules the write: a burst of requests (e.g. a slider) ends
+        # up as one BLE write with the latest value per debounce interval.
+        self._pending_speed = speed_kmh
+        if self._speed_timer is None:
+            loop = asyncio.get_running_loop()
+            self._speed_timer = loop.call_later(self.SPEED_DEBOUNCE_INTERVAL, self._flush_speed)
 
     def get_status(self) -> TreadmillStatus:
-        return TreadmillStatus(
-            isConnected=bool(self._client and self._client.is_connected),
-            isRunning=self._is_running,
-            currentSpeedKmh=self._current_speed_kmh,
-            elapsedTimeSeconds=self._elapsed_time_seconds,
-            burnedCalories=self._burned_calories,
-            totalDistanceKm=self._total_distance_km,
-            minSpeedKmh=self._min_speed_kmh,
-            maxSpeedKmh=self._max_speed_kmh,
-        )
+        return {
+            "isConnected": self._connected,
+            "isRunning": self._is_running,
+            "currentSpeedKmh": self._current_speed_kmh,
+            "elapsedTimeSeconds": self._elapsed_time_seconds,
+            "burnedCalories": self._burned_calories,
+            "totalDistanceKm": self._total_distance_km,
+            "minSpeedKmh": self._min_speed_kmh,
+            "maxSpeedKmh": self._max_speed_kmh,
+        }
+
+    def get_status_json(self) -> bytes:
+        # State only changes on BLE events and commands, so serve the cached
+        # payload until one of those invalidates it.
+        if self._status_json is None:
+            self._status_json = orjson.dumps(self.get_status())
+        return self._status_json
 
     # -------- command builders (matching what we used before) --------
 
     @staticmethod
     def _build_start_command() -> bytes:
-        # fa ef 11 00 00 00 00 f3 04
-        return bytes([0xFA, 0xEF, 0x11, 0x00, 0x00, 0x00, 0x00, 0xF3, 0x04])
+        return _START_CMD
 
     @staticmethod
     def _build_stop_command() -> bytes:
-        # fa ef 11 00 00 00 00 f4 05
-        return bytes([0xFA, 0xEF, 0x11, 0x00, 0x00, 0x00, 0x00, 0xF4, 0x05])
+        return _STOP_CMD
 
     @staticmethod
     def _build_speed_command(kmh: float) -> bytes:
         speed_code = int(round(kmh * 10.0))
-        speed_code_byte = speed_code & 0xFF
-        checksum = (speed_code_byte + 0x22) & 0xFF
-
-        return bytes(
-            [
-                0xFA,
-                0xEF,
-                0x11,
-                0x00,
-                0x00,
-                0x00,
-                speed_code_byte,
-                0x11,
-                checksum,
-            ]
-        )
+        frame = _SPEED_FRAMES.get(speed_code)
+        if frame is not None:
+            return frame
+        return _encode_speed_frame(speed_code)
+
@@ -99,6 +99,14 @@ export class AppComponent implements OnInit {
         this.status = status;
       }
     });
+
+    // Speed writes are applied after the HTTP request returns
+    this.treadmill.commandErrors$.subscribe(error => {
+      console.error('Treadmill command failed', error);
+      this.showErrorBanner(
+        error.command === 'speed' ? 'Could not set speed.' : 'Treadmill command failed.'
+      );
+    });
   }
 
   get isConnected(): boolean {
@@ -183,8 +191,7 @@ export class AppComponent implements OnInit {
     this.isSendingCommand = true;
 
     const current = this.status?.currentSpeedKmh ?? this.speedInput ?? 0;
-    this.treadmill.setSpeed(current + delta).subscribe({
-      next: s => this.status = s,
+    this.treadmill.setSpeed(this.clampSpeed(current + delta)).subscribe({
       error: err => {
         console.error('Set speed (delta) failed', err);
         this.showErrorBanner('Could not adjust speed.');
@@ -200,8 +207,7 @@ export class AppComponent implements OnInit {
     if (!this.isConnected || this.isSendingCommand) return;
     this.isSendingCommand = true;
 
-    this.treadmill.setSpeed(this.speedInput).subscribe({
-      next: s => this.status = s,
+    this.treadmill.setSpeed(this.clampSpeed(this.speedInput)).subscribe({
       error: err => {
         console.error('Set speed failed', err);
         this.showErrorBanner('Could not set speed.');
@@ -213,6 +219,13 @@ export class AppComponent implements OnInit {
     });
   }
 
+  // Keep requests inside the treadmill's range; the API rejects negative speeds
+  private clampSpeed(value: number): number {
+    const min = Math.max(this.status?.minSpeedKmh ?? 0, 0);
+    const max = this.status?.maxSpeedKmh || value;
+    return Math.min(Math.max(value, min), max);
+  }
+
   onShortcutSpeed(value: number): void {
     // update local input and apply immediately when connected
     this.speedInput = value;
@@ -368,7 +381,6 @@ export class AppComponent implements OnInit {
     const applySpeed = () => {
       this.isSendingCommand = true;
       this.treadmill.setSpeed(segment.speedKmh).subscribe({
-        next: s => (this.status = s),
         error: err => {
           console.error('HIIT set speed failed', err);
           this.showErrorBanner('Could not set HIIT speed.');
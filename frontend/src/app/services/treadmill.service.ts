@@ -1,6 +1,6 @@
 import { Injectable, OnDestroy, NgZone } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { BehaviorSubject, Observable } from 'rxjs';
+import { BehaviorSubject, Observable, Subject } from 'rxjs';
 
 export interface TreadmillStatus {
   isConnected: boolean;
@@ -13,6 +13,12 @@ export interface TreadmillStatus {
   maxSpeedKmh: number;
 }
 
+// Failure of a command the backend ran after already answering the request
+export interface CommandError {
+  command: string;
+  detail: string;
+}
+
 @Injectable({
   providedIn: 'root'
 })
@@ -23,6 +29,9 @@ export class TreadmillService implements OnDestroy{
   private statusSubject = new BehaviorSubject<TreadmillStatus | null>(null);
   status$: Observable<TreadmillStatus | null> = this.statusSubject.asObservable();
 
+  private commandErrorSubject = new Subject<CommandError>();
+  commandErrors$: Observable<CommandError> = this.commandErrorSubject.asObservable();
+
   constructor(
     private http: HttpClient,
     private zone: NgZone) {}
@@ -33,21 +42,34 @@ export class TreadmillService implements OnDestroy{
     }
 
     // If frontend and backend are same origin (via Docker), relative URL is enough:
-    this.eventSource = new EventSource('/api/events');
+    this.eventSource = new EventSource('/api/status/stream');
 
     this.eventSource.onmessage = (event: MessageEvent) => {
       try {
         console.log('SSE message received', event.data);
-        const data = JSON.parse(event.data) as TreadmillStatus;
+        // First event is a full snapshot, later ones only carry changed fields
+        const delta = JSON.parse(event.data) as Partial<TreadmillStatus>;
         
         this.zone.run(() => {
-          this.statusSubject.next(data);
+          const current = this.statusSubject.value;
+          this.statusSubject.next({ ...current, ...delta } as TreadmillStatus);
         });
       } catch (err) {
         console.error('Failed to parse SSE data', err, event.data);
       }
     };
 
+    this.eventSource.addEventListener('commandError', (event: MessageEvent) => {
+      try {
+        const error = JSON.parse(event.data) as CommandError;
+        this.zone.run(() => {
+          this.commandErrorSubject.next(error);
+        });
+      } catch (err) {
+        console.error('Failed to parse SSE data', err, event.data);
+      }
+    });
+
     this.eventSource.onerror = (err) => {
       console.error('SSE error', err);
       // Optionally auto-reconnect: close and recreate after a timeout
@@ -81,7 +103,8 @@ export class TreadmillService implements OnDestroy{
     return this.http.post<TreadmillStatus>('/api/stop', {});
   }
 
-  setSpeed(speedKmh: number): Observable<TreadmillStatus> {
-    return this.http.post<TreadmillStatus>('/api/speed', { speedKmh });
+  // Accepted asynchronously (202, no body); the new speed arrives via SSE
+  setSpeed(speedKmh: number): Observable<void> {
+    return this.http.post<void>('/api/speed', { speedKmh });
   }
 }
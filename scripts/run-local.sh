@@ -101,4 +101,4 @@ echo "[+] Starting server: $PYTHON_BIN $PYTHON_ENTRY"
 echo "[i] (Ctrl+C to stop)"
 
 cd backend
-uvicorn app:app --host 0.0.0.0 --port 5227 --reload
+uvicorn app:app --host 0.0.0.0 --port 5227 --loop uvloop --reload